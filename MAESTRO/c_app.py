@@ -3,13 +3,16 @@
 import streamlit as st
 from pathlib import Path
 import pandas as pd
-import docx
+import numpy as np
+import io
 import json
+import orjson
 import os
 import re
+import datetime
+import functools
 from collections import defaultdict
 from dotenv import load_dotenv
-from concurrent.futures import ThreadPoolExecutor
 
 st.set_page_config(page_title="MAESTRO: Component Risk", layout="centered")
 
@@ -26,9 +29,28 @@ for folder in ['historical_documents', 'risks_document', 'target_document', 'out
 
 # === Utility Functions ===
 
+_MISSING = object()
+_HAS_DIGIT = re.compile(r"\d").search
+_UNIT_TABLE = str.maketrans({"µ": "u", "Ω": "ohm", "k": "000"})
+_BYTES_LOWER = bytes.maketrans(bytes(range(0x41, 0x5B)), bytes(range(0x61, 0x7B)))
+
+def _normalize_text_uncached(value):
+    if value.isascii():
+        # Pure ASCII cannot contain µ or Ω, so only "k" needs expanding before a byte-table lowercase.
+        return value.replace("k", "000").encode("ascii").translate(_BYTES_LOWER).decode("ascii").strip()
+    return value.translate(_UNIT_TABLE).lower().strip()
+
+@st.cache_resource
+def _unit_normalizer():
+    # Streamlit re-executes this script on every rerun, which would rebuild a
+    # module-level lru_cache; keep one memoized normalizer for the server's lifetime.
+    return functools.lru_cache(maxsize=8192)(_normalize_text_uncached)
+
+_normalize_text = _unit_normalizer()
+
 def normalize_units(value):
     if isinstance(value, str):
-        value = value.replace("µ", "u").replace("Ω", "ohm").replace("k", "000").lower()
+        return _normalize_text(value)
     return str(value).strip()
 
 def within_tolerance(expected, actual, tolerance=0.05):
@@ -39,53 +61,195 @@ def within_tolerance(expected, actual, tolerance=0.05):
     except:
         return False
 
-def match_component_to_spec(component_data, sae_specs, user_inputs):
-    for spec in sae_specs:
-        match = True
-        reasons = []
-        for key in user_inputs:
-            spec_val = normalize_units(spec.get(key, ""))
-            comp_val = normalize_units(component_data.get(key, ""))
-            user_val = normalize_units(user_inputs[key])
-
-            if not comp_val or not spec_val:
-                match = False
-                reasons.append(f"Missing key: {key} in component or spec.")
-                continue
-
-            if spec_val != user_val:
-                match = False
-                reasons.append(f"Mismatch: user required {key} = {user_val}, SAE has {spec_val}")
-
-            if re.search(r"\d", comp_val) and re.search(r"\d", spec_val):
-                if not within_tolerance(spec_val, comp_val):
-                    match = False
-                    reasons.append(f"Out of tolerance: {key} component={comp_val} spec={spec_val}")
-
-        if match:
-            return True, f"Component matches SAE specification: {spec.get('id', 'N/A')}"
-    return False, f"No SAE spec match found. Issues: {'; '.join(reasons)}"
+def _to_float(value):
+    # Same parsing rule as within_tolerance (float(), so "1_000" and Unicode
+    # digits parse); anything float() rejects becomes NaN.
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
 
-def parse_uploaded_file(file):
-    ext = file.name.split('.')[-1].lower()
+def _to_float_array(values):
+    return np.fromiter(map(_to_float, values), dtype=float, count=len(values))
+
+def tolerance_mask(expected, actual, tolerance=0.05):
+    # Vectorized within_tolerance: one expected value against an array of actual
+    # values. NaN (anything float() rejects) compares False.
+    expected_val = _to_float(expected)
+    actual_val = _to_float_array(actual)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.abs(expected_val - actual_val) / expected_val <= tolerance
+
+def has_digit(values):
+    return pd.Series(values, dtype=object).str.contains(r"\d", regex=True).to_numpy(dtype=bool)
+
+def mismatch_reasons(comp_vals, spec_vals, user_vals):
+    reasons = []
+    for key, user_val in user_vals.items():
+        spec_val = spec_vals[key]
+        comp_val = comp_vals[key]
+
+        if not comp_val or not spec_val:
+            reasons.append(f"Missing key: {key} in component or spec.")
+            continue
+
+        if spec_val != user_val:
+            reasons.append(f"Mismatch: user required {key} = {user_val}, SAE has {spec_val}")
+
+        if _HAS_DIGIT(comp_val) and _HAS_DIGIT(spec_val):
+            if not within_tolerance(spec_val, comp_val):
+                reasons.append(f"Out of tolerance: {key} component={comp_val} spec={spec_val}")
+    return reasons
+
+def spec_columns(sae_specs):
+    # Column-wise view of the specs. DataFrames are read column by column; for
+    # a JSON array, keys a spec does not define are marked with _MISSING.
+    if isinstance(sae_specs, pd.DataFrame):
+        return {col: sae_specs[col].tolist() for col in sae_specs.columns}
+    columns = dict.fromkeys(key for spec in sae_specs for key in spec)
+    return {col: [spec.get(col, _MISSING) for spec in sae_specs] for col in columns}
+
+def normalize_spec_columns(spec_cols):
+    # None marks a missing key; every present value normalizes to a string.
+    return {
+        col: np.array([None if val is _MISSING else normalize_units(val) for val in vals], dtype=object)
+        for col, vals in spec_cols.items()
+    }
+
+def spec_record(spec_cols, spec_records, i):
+    # Rebuilds a spec row as a dict on first use and memoizes it in spec_records.
+    if i not in spec_records:
+        spec_records[i] = {col: vals[i] for col, vals in spec_cols.items() if vals[i] is not _MISSING}
+    return spec_records[i]
+
+def index_specs(specs_norm, keys, n_spec):
+    missing = np.full(n_spec, None, dtype=object)
+    key_cols = [specs_norm.get(key, missing) for key in keys]
+    spec_index = defaultdict(list)
+    for i, values in enumerate(zip(*key_cols) if keys else [()] * n_spec):
+        spec_index[values].append(i)
+    return spec_index
+
+def match_component_to_spec(component_df, spec_cols, spec_records, specs_norm, user_vals, spec_index, n_spec):
+    # Every candidate from spec_index holds exactly the user's normalized values,
+    # so the checks specialize to user_vals: per key, one vector over the
+    # components with the user value standing in for every candidate spec.
+    # Returns one (is_match, reason) pair per component row.
+    candidates = spec_index.get(tuple(user_vals.values()), [])
+    comp_norm = {}
+    for key in user_vals:
+        if key in component_df.columns:
+            comp_norm[key] = component_df[key].map(normalize_units).to_numpy(dtype=object)
+        else:
+            comp_norm[key] = np.full(len(component_df), "", dtype=object)
+
+    # Rows with the same normalized key values always get the same result, so
+    # each distinct key row is evaluated once and scattered back at the end.
+    if comp_norm:
+        row_ids, unique_rows = pd.factorize(pd.MultiIndex.from_arrays(list(comp_norm.values())))
+        comp_norm = {key: unique_rows.get_level_values(j).to_numpy(dtype=object) for j, key in enumerate(comp_norm)}
+        n_unique = len(unique_rows)
+    else:
+        row_ids = np.zeros(len(component_df), dtype=int)
+        n_unique = min(len(component_df), 1)
+
+    match = np.full(n_unique, bool(candidates))
+    for key, user_val in user_vals.items():
+        comp_vals = comp_norm[key]
+        match &= comp_vals != ""
+        if _HAS_DIGIT(user_val):
+            rows = np.flatnonzero(has_digit(comp_vals))
+            match[rows] &= tolerance_mask(user_val, comp_vals[rows])
+
+    results = []
+    for i, is_match in enumerate(match):
+        if is_match:
+            spec = spec_record(spec_cols, spec_records, candidates[0])
+            results.append((True, f"Component matches SAE specification: {spec.get('id', 'N/A')}"))
+        else:
+            reasons = []
+            if n_spec:
+                reasons = mismatch_reasons(
+                    {key: vals[i] for key, vals in comp_norm.items()},
+                    {key: specs_norm[key][-1] if key in specs_norm else None for key in user_vals},
+                    user_vals,
+                )
+            results.append((False, f"No SAE spec match found. Issues: {'; '.join(reasons)}"))
+    return [results[i] for i in row_ids]
+
+def _read_csv(data):
+    # PyArrow only matches the C engine on UTF-8 input: for other encodings it
+    # returns bytes cells where the C engine raises UnicodeDecodeError.
+    try:
+        data.decode("utf-8")
+    except UnicodeDecodeError:
+        return pd.read_csv(io.BytesIO(data))
+    try:
+        df = pd.read_csv(io.BytesIO(data), engine="pyarrow")
+    except pd.errors.ParserError:
+        # PyArrow rejects ragged rows that the C engine pads with NaN.
+        return pd.read_csv(io.BytesIO(data))
+    # PyArrow infers dates, times and timestamps; the C engine keeps the source
+    # strings, which is what matching and suggest_alternatives compare against.
+    temporal = [
+        col for col in df.columns
+        if df[col].dtype.kind == "M"
+        or (df[col].dtype == object and df[col].map(lambda v: isinstance(v, (datetime.date, datetime.time))).any())
+    ]
+    if temporal:
+        df[temporal] = pd.read_csv(io.BytesIO(data), usecols=temporal)[temporal]
+    return df
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _parse_bytes(name, file_id, _data):
+    # Keyed on the upload's name and file_id; the leading underscore tells
+    # Streamlit not to hash the raw bytes on every rerun.
+    ext = name.split('.')[-1].lower()
+    file = io.BytesIO(_data)
     if ext == "csv":
-        return pd.read_csv(file)
+        return _read_csv(_data)
     elif ext in ["xls", "xlsx"]:
         return pd.read_excel(file)
     elif ext == "json":
         return json.load(file)
     elif ext == "docx":
+        import docx
         doc = docx.Document(file)
         return "\n".join([p.text for p in doc.paragraphs])
     else:
         return "Unsupported file format"
 
+def parse_uploaded_file(file):
+    return _parse_bytes(file.name, file.file_id, file.getvalue())
+
 def process_bulk_components(component_df, sae_specs, user_inputs):
-    def evaluate_row(row):
-        component_data = row.to_dict()
-        is_match, reason = match_component_to_spec(component_data, sae_specs, user_inputs)
+    # sae_specs may be a DataFrame or a JSON array of dicts; both are read into columns.
+    n_spec = len(sae_specs)
+    spec_cols = spec_columns(sae_specs)
+    specs_norm = normalize_spec_columns(spec_cols)
+    user_norm = {key: normalize_units(val) for key, val in user_inputs.items()}
+    # JSON specs are already dicts; DataFrame rows are only built for reported specs.
+    spec_records = {} if isinstance(sae_specs, pd.DataFrame) else dict(enumerate(sae_specs))
+    spec_index = index_specs(specs_norm, list(user_norm), n_spec)
+    matches = match_component_to_spec(component_df, spec_cols, spec_records, specs_norm, user_norm, spec_index, n_spec)
+    columns = component_df.columns.tolist()
+    alt_index = index_alternatives(specs_norm, columns, n_spec)
+
+    alternatives_by_row = {}
+
+    def evaluate_row(row, matched):
+        component_data = dict(zip(columns, row))
+        is_match, reason = matched
         summary = generate_component_summary(component_data, is_match, reason)
-        alternatives = suggest_alternatives(component_data, sae_specs) if not is_match else []
+        alternatives = []
+        if not is_match:
+            # Identical BOM rows share one lookup. The key is what suggest_alternatives
+            # compares (normalized values, so blank NaN cells match and -0.0 != 0.0),
+            # plus value types so 1 and True stay apart.
+            row_key = (tuple(map(normalize_units, row)), tuple(map(type, row)))
+            if row_key not in alternatives_by_row:
+                alternatives_by_row[row_key] = suggest_alternatives(component_data, spec_cols, specs_norm, alt_index, spec_records)
+            alternatives = alternatives_by_row[row_key]
         return {
             "component": component_data,
             "match": is_match,
@@ -94,8 +258,8 @@ def process_bulk_components(component_df, sae_specs, user_inputs):
             "alternatives": alternatives,
             "risk_reduction": 0 if not is_match else 100
         }
-    with ThreadPoolExecutor() as executor:
-        return list(executor.map(evaluate_row, [row for _, row in component_df.iterrows()]))
+    rows = component_df.itertuples(index=False, name=None)
+    return [evaluate_row(row, matched) for row, matched in zip(rows, matches)]
 
 def generate_component_summary(component, match, reason):
     if match:
@@ -105,28 +269,60 @@ def generate_component_summary(component, match, reason):
         return (f"Component {component.get('part_number', 'N/A')} does not meet required specifications. "
                 f"Risk coverage remains at 0%. Issues: {reason}.")
 
-def suggest_alternatives(component, sae_specs):
+def index_alternatives(specs_norm, columns, n_spec):
+    # Inverted index for suggest_alternatives: how many component columns each
+    # spec shares, and (column, normalized value) -> positions of specs holding it.
+    shared_keys = np.zeros(n_spec, dtype=np.int32)
+    by_value = defaultdict(list)
+    for k in columns:
+        if k not in specs_norm:
+            continue
+        values = specs_norm[k]
+        present = pd.notna(values)
+        shared_keys += present
+        for i in np.flatnonzero(present):
+            by_value[(k, values[i])].append(i)
+    return shared_keys, {kv: np.array(ids) for kv, ids in by_value.items()}
+
+def suggest_alternatives(component, spec_cols, specs_norm, alt_index, spec_records):
+    shared_keys, by_value = alt_index
+    component_norm = {k: normalize_units(v) for k, v in component.items()}
+    # Shared keys minus keys with an equal value gives each spec's difference count.
+    diff_counts = shared_keys.copy()
+    for kv in component_norm.items():
+        same = by_value.get(kv)
+        if same is not None:
+            diff_counts[same] -= 1
+
     candidates = []
-    for spec in sae_specs:
-        differences = []
-        for k in component:
-            if k in spec and normalize_units(component[k]) != normalize_units(spec[k]):
-                differences.append((k, component[k], spec[k]))
-        if len(differences) <= 2:
-            candidates.append({"spec": spec, "differences": differences})
+    for i in np.flatnonzero(diff_counts <= 2).tolist():
+        differences = [(k, component[k], spec_cols[k][i]) for k in component
+                       if k in specs_norm and specs_norm[k][i] is not None
+                       and component_norm[k] != specs_norm[k][i]]
+        candidates.append({"spec": spec_record(spec_cols, spec_records, i), "differences": differences})
     return candidates
 
+def _dump_json(data):
+    return orjson.dumps(data, default=str, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
 def save_program_data(program_name, data):
-    path = Path("local_program_data") / f"{program_name}.json"
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
+    (Path("local_program_data") / f"{program_name}.json").write_bytes(_dump_json(data))
+    list_saved_programs.clear()
 
 def load_program_data(program_name):
     path = Path("local_program_data") / f"{program_name}.json"
     if not path.exists():
         return {}
-    with open(path, "r") as f:
-        return json.load(f)
+    raw = path.read_bytes()
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # Older saves were written by json.dump and may contain NaN literals.
+        return json.loads(raw)
+
+@st.cache_data(ttl=5, show_spinner=False)
+def list_saved_programs():
+    return sorted([f.stem for f in Path("local_program_data").glob("*.json")])
 
 # === Sidebar Input ===
 st.sidebar.header("Component Requirement Inputs")
@@ -157,9 +353,7 @@ if st.button("🔍 Run Evaluation"):
     if spec_file and component_file:
         try:
             sae_raw = parse_uploaded_file(spec_file)
-            if isinstance(sae_raw, pd.DataFrame):
-                sae_specs = sae_raw.to_dict(orient="records")
-            elif isinstance(sae_raw, list):
+            if isinstance(sae_raw, (pd.DataFrame, list)):
                 sae_specs = sae_raw
             else:
                 st.error("SAE Specs must be a JSON array or tabular file.")
@@ -183,7 +377,7 @@ if st.button("🔍 Run Evaluation"):
                     for alt in res["alternatives"]:
                         st.json(alt)
 
-            st.download_button("📄 Export Results (JSON)", json.dumps(results, indent=2), file_name=f"{program_name}_results.json")
+            st.download_button("📄 Export Results (JSON)", _dump_json(results), file_name=f"{program_name}_results.json")
             st.download_button("📃 Export Summary (TXT)", "\n\n".join(r['summary'] for r in results), file_name=f"{program_name}_results.txt")
         except Exception as e:
             st.error(f"⚠️ Error during processing: {e}")
@@ -193,7 +387,7 @@ if st.button("🔍 Run Evaluation"):
 # === Load Past Data ===
 st.markdown("---")
 st.subheader("📁 Load Previous Program")
-all_programs = sorted([f.stem for f in Path("local_program_data").glob("*.json")])
+all_programs = list_saved_programs()
 if all_programs:
     selected_program = st.selectbox("Select a saved program:", all_programs)
     if st.button("🔄 Load Program"):
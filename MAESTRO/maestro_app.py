@@ -15,13 +15,10 @@ import re
 import io
 import json
 import glob
-import plotly.graph_objects as go
 import pandas as pd
 from collections import Counter
 from collections import defaultdict
-from PIL import Image
 from pathlib import Path
-import pandas as pd
 import streamlit as st
 from dotenv import load_dotenv
 from langchain_core.prompts import PromptTemplate
@@ -30,15 +27,6 @@ from langchain_community.vectorstores import FAISS
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langchain_core.documents import Document as LCDocument
 from PyPDF2 import PdfReader
-from docx import Document
-import warnings
-import shutil
-import streamlit as st
-import streamlit.components.v1 as components
-
-
-warnings.filterwarnings("ignore", category=DeprecationWarning)
-warnings.filterwarnings("ignore", category=pd.errors.ParserWarning)
 
 # STEP 2: Load Environment Variables
 load_dotenv()
@@ -305,6 +293,7 @@ def preview_file(file, file_type, name="Uploaded file"):
         highlighted_text = text[:2000].replace("risk", "**:red[risk]**").replace("delay", "**:orange[delay]**")
         st.markdown(highlighted_text, unsafe_allow_html=True)
     elif file_type == "docx":
+        from docx import Document
         doc = Document(file)
         text = "\n".join([p.text for p in doc.paragraphs])
         st.text_area("DOCX Preview", text[:2000], height=200)
@@ -318,8 +307,7 @@ col_logo, col_title = st.columns([1, 4])  # Adjust width ratio if needed
 
 with col_logo:
     if logo_path.exists():
-        logo = Image.open(logo_path)
-        st.image(logo, width=100)  # Optional: reduce width for balance
+        st.image(str(logo_path), width=100)  # Optional: reduce width for balance
 
 with col_title:
     st.markdown("<h1 style='margin-bottom: 0;'>MAESTRO</h1>", unsafe_allow_html=True)
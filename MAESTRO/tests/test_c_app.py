@@ -0,0 +1,135 @@
+import importlib.util
+import io
+import os
+from pathlib import Path
+
+import pytest
+
+APP_PATH = Path(__file__).resolve().parent.parent / "c_app.py"
+
+
+@pytest.fixture(scope="module")
+def app(tmp_path_factory):
+    # c_app.py is a Streamlit script; importing it runs the UI in bare mode and
+    # creates its data folders in the working directory.
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("app"))
+    try:
+        spec = importlib.util.spec_from_file_location("c_app", APP_PATH)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        os.chdir(cwd)
+    return module
+
+
+class Upload(io.BytesIO):
+    def __init__(self, name, data, file_id):
+        super().__init__(data)
+        self.name = name
+        self.file_id = file_id
+
+
+def test_non_utf8_csv_raises_instead_of_returning_bytes(app):
+    data = "part_number,value\nR1,10k\nC1,10µ\n".encode("cp1252")
+    with pytest.raises(UnicodeDecodeError):
+        app.parse_uploaded_file(Upload("bom.csv", data, "cp1252"))
+
+
+def test_ragged_csv_rows_are_padded(app):
+    df = app.parse_uploaded_file(Upload("bom.csv", b"a,b,c\n1,2,3\n4,5\n", "ragged"))
+    assert df.shape == (2, 3)
+    assert df["c"].isna().tolist() == [False, True]
+
+
+def test_csv_date_and_time_columns_keep_source_strings(app):
+    data = b"part_number,date_code,built,shift,qty\nR1,2024-01-01,2024-01-01T10:00,12:30:00,5\nR2,,2024-01-02 00:00,,7\n"
+    df = app.parse_uploaded_file(Upload("bom.csv", data, "dates"))
+    assert df["date_code"].tolist()[0] == "2024-01-01"
+    assert df["built"].tolist() == ["2024-01-01T10:00", "2024-01-02 00:00"]
+    assert df["shift"].tolist()[0] == "12:30:00"
+    assert df["qty"].tolist() == [5, 7]
+
+
+def test_duplicate_rows_with_blank_cells_share_alternatives(app):
+    import pandas as pd
+
+    specs = [{"id": "S1", "type": "resistor", "value": "10k", "voltage": "50"}]
+    components = pd.DataFrame(
+        {"type": ["resistor", "resistor"], "value": ["4.7k", "4.7k"], "voltage": [float("nan"), float("nan")]}
+    )
+    results = app.process_bulk_components(components, specs, {"value": "10k"})
+    assert [r["match"] for r in results] == [False, False]
+    assert results[0]["alternatives"] is results[1]["alternatives"]
+
+
+def _as_frame(specs):
+    import pandas as pd
+
+    return pd.DataFrame(specs)
+
+
+MATCH_CASES = [
+    pytest.param(
+        # Candidates are looked up by the user's values; the first one (not spec 0) is reported.
+        [
+            {"id": "S0", "value": "22k", "voltage": "50"},
+            {"id": "S1", "value": "10k", "voltage": "50"},
+            {"id": "S2", "value": "10k", "voltage": "50"},
+        ],
+        {"part_number": "R1", "value": "10100", "voltage": "50"},
+        {"value": "10k", "voltage": "50"},
+        True,
+        "Component matches SAE specification: S1",
+        id="first-matching-spec",
+    ),
+    pytest.param(
+        # A non-match reports the issues found against the last spec in the file.
+        [
+            {"id": "S1", "value": "10k", "voltage": "50"},
+            {"id": "S2", "value": "22k", "voltage": "25"},
+        ],
+        {"part_number": "R1", "value": "47k", "voltage": "50"},
+        {"value": "10k"},
+        False,
+        "No SAE spec match found. Issues: Mismatch: user required value = 10000, SAE has 22000; "
+        "Out of tolerance: value component=47000 spec=22000",
+        id="reasons-from-last-spec",
+    ),
+]
+
+
+@pytest.mark.parametrize("spec_form", [list, _as_frame], ids=["json", "dataframe"])
+@pytest.mark.parametrize("specs, component, user_inputs, is_match, reason", MATCH_CASES)
+def test_process_bulk_components_match(app, spec_form, specs, component, user_inputs, is_match, reason):
+    import pandas as pd
+
+    [result] = app.process_bulk_components(pd.DataFrame([component]), spec_form(specs), user_inputs)
+    assert result["match"] is is_match
+    assert result["reason"] == reason
+    assert result["risk_reduction"] == (100 if is_match else 0)
+
+
+def test_json_specs_distinguish_missing_keys_from_nulls(app):
+    import pandas as pd
+
+    specs = [
+        {"id": "S1", "type": "resistor", "value": "10k"},
+        {"id": "S2", "type": None, "value": "22k", "voltage": "50"},
+        {"id": "S3", "type": "resistor", "value": "22k"},
+    ]
+    component = {"type": "resistor", "value": "10k", "voltage": "50"}
+    [result] = app.process_bulk_components(pd.DataFrame([component]), specs, {"value": "10k", "voltage": "50"})
+
+    # S3 has no voltage key, so the reasons report it as missing rather than mismatched.
+    assert result["reason"] == (
+        "No SAE spec match found. Issues: Mismatch: user required value = 10000, SAE has 22000; "
+        "Out of tolerance: value component=10000 spec=22000; Missing key: voltage in component or spec."
+    )
+    # A missing key is not a difference; an explicit null is. Specs are reported as given.
+    assert result["alternatives"] == [
+        {"spec": specs[0], "differences": []},
+        {"spec": specs[1], "differences": [("type", "resistor", None), ("value", "10k", "22k")]},
+        {"spec": specs[2], "differences": [("value", "10k", "22k")]},
+    ]
+    assert "voltage" not in result["alternatives"][0]["spec"]